@@ -1,78 +1,64 @@
 import streamlit as st
-from helper import predict
+from constants import CATEGORICAL_OPTIONS
+from helper import cached_predict
 
 # Define the page layout
 st.title("Health Insurance Cost Predictor")
 
-categorical_options = {
-    "Gender": ["Male", "Female"],
-    "Marital Status": ["Unmarried", "Married"],
-    "BMI Category": ["Normal", "Obesity", "Overweight", "Underweight"],
-    "Smoking Status": ["No Smoking", "Regular", "Occasional"],
-    "Employment Status": ["Salaried", "Self-Employed", "Freelancer", ""],
-    "Region": ["Northwest", "Southeast", "Northeast", "Southwest"],
-    "Medical History": [
-        "No Disease",
-        "Diabetes",
-        "High blood pressure",
-        "Diabetes & High blood pressure",
-        "Thyroid",
-        "Heart disease",
-        "High blood pressure & Heart disease",
-        "Diabetes & Thyroid",
-        "Diabetes & Heart disease",
-    ],
-    "Insurance Plan": ["Bronze", "Silver", "Gold"],
-}
+# Group the inputs in a form so the script only reruns on submit,
+# not on every widget change
+with st.form("predict_form"):
+    # Create four rows of three columns each
+    row1 = st.columns(3)
+    row2 = st.columns(3)
+    row3 = st.columns(3)
+    row4 = st.columns(3)
 
-# Create four rows of three columns each
-row1 = st.columns(3)
-row2 = st.columns(3)
-row3 = st.columns(3)
-row4 = st.columns(3)
+    # Assign inputs to the grid
+    with row1[0]:
+        age = st.number_input("Age", min_value=18, step=1, max_value=100)
+    with row1[1]:
+        number_of_dependants = st.number_input(
+            "Number of Dependants", min_value=0, step=1, max_value=20
+        )
+    with row1[2]:
+        income_lakhs = st.number_input(
+            "Income in Lakhs", step=1, min_value=0, max_value=200
+        )
 
-# Assign inputs to the grid
-with row1[0]:
-    age = st.number_input("Age", min_value=18, step=1, max_value=100)
-with row1[1]:
-    number_of_dependants = st.number_input(
-        "Number of Dependants", min_value=0, step=1, max_value=20
-    )
-with row1[2]:
-    income_lakhs = st.number_input(
-        "Income in Lakhs", step=1, min_value=0, max_value=200
-    )
+    with row2[0]:
+        genetical_risk = st.number_input("Genetical Risk", step=1, min_value=0, max_value=5)
+    with row2[1]:
+        insurance_plan = st.selectbox(
+            "Insurance Plan", CATEGORICAL_OPTIONS["Insurance Plan"]
+        )
+    with row2[2]:
+        employment_status = st.selectbox(
+            "Employment Status", CATEGORICAL_OPTIONS["Employment Status"]
+        )
 
-with row2[0]:
-    genetical_risk = st.number_input("Genetical Risk", step=1, min_value=0, max_value=5)
-with row2[1]:
-    insurance_plan = st.selectbox(
-        "Insurance Plan", categorical_options["Insurance Plan"]
-    )
-with row2[2]:
-    employment_status = st.selectbox(
-        "Employment Status", categorical_options["Employment Status"]
-    )
+    with row3[0]:
+        gender = st.selectbox("Gender", CATEGORICAL_OPTIONS["Gender"])
+    with row3[1]:
+        marital_status = st.selectbox(
+            "Marital Status", CATEGORICAL_OPTIONS["Marital Status"]
+        )
+    with row3[2]:
+        bmi_category = st.selectbox("BMI Category", CATEGORICAL_OPTIONS["BMI Category"])
 
-with row3[0]:
-    gender = st.selectbox("Gender", categorical_options["Gender"])
-with row3[1]:
-    marital_status = st.selectbox(
-        "Marital Status", categorical_options["Marital Status"]
-    )
-with row3[2]:
-    bmi_category = st.selectbox("BMI Category", categorical_options["BMI Category"])
+    with row4[0]:
+        smoking_status = st.selectbox(
+            "Smoking Status", CATEGORICAL_OPTIONS["Smoking Status"]
+        )
+    with row4[1]:
+        region = st.selectbox("Region", CATEGORICAL_OPTIONS["Region"])
+    with row4[2]:
+        medical_history = st.selectbox(
+            "Medical History", CATEGORICAL_OPTIONS["Medical History"]
+        )
 
-with row4[0]:
-    smoking_status = st.selectbox(
-        "Smoking Status", categorical_options["Smoking Status"]
-    )
-with row4[1]:
-    region = st.selectbox("Region", categorical_options["Region"])
-with row4[2]:
-    medical_history = st.selectbox(
-        "Medical History", categorical_options["Medical History"]
-    )
+    # Button to make prediction
+    submitted = st.form_submit_button("Predict")
 
 # Create a dictionary for input values
 input_dict = {
@@ -90,7 +76,6 @@ input_dict = {
     "Medical History": medical_history,
 }
 
-# Button to make prediction
-if st.button("Predict"):
-    prediction = predict(input_dict)
+if submitted:
+    prediction = cached_predict(tuple(sorted(input_dict.items())))
     st.success(f"Predicted Health Insurance Cost: {prediction}")
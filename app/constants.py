@@ -0,0 +1,24 @@
+from types import MappingProxyType
+
+# Options offered by the app's selectboxes, shared with helper.py so the UI
+# and the preprocessing stay in sync
+CATEGORICAL_OPTIONS = MappingProxyType({
+    "Gender": ("Male", "Female"),
+    "Marital Status": ("Unmarried", "Married"),
+    "BMI Category": ("Normal", "Obesity", "Overweight", "Underweight"),
+    "Smoking Status": ("No Smoking", "Regular", "Occasional"),
+    "Employment Status": ("Salaried", "Self-Employed", "Freelancer", ""),
+    "Region": ("Northwest", "Southeast", "Northeast", "Southwest"),
+    "Medical History": (
+        "No Disease",
+        "Diabetes",
+        "High blood pressure",
+        "Diabetes & High blood pressure",
+        "Thyroid",
+        "Heart disease",
+        "High blood pressure & Heart disease",
+        "Diabetes & Thyroid",
+        "Diabetes & Heart disease",
+    ),
+    "Insurance Plan": ("Bronze", "Silver", "Gold"),
+})
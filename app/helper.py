@@ -1,15 +1,227 @@
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import warnings
+import numpy as np
 import pandas as pd
 import joblib
 from pathlib import Path
 
+from sklearn.linear_model import LinearRegression
+
+from constants import CATEGORICAL_OPTIONS
+
+try:
+    import streamlit as st
+except ImportError:  # allow using the helper outside of the Streamlit app
+    st = None
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 ARTIFACTS_DIR = BASE_DIR / "artifacts"
 
-# Load your models and scalers
-model_young = joblib.load(ARTIFACTS_DIR / "model_young.joblib")
-model_rest = joblib.load(ARTIFACTS_DIR / "model_rest.joblib")
-scaler_young = joblib.load(ARTIFACTS_DIR / "scaler_young.joblib")
-scaler_rest = joblib.load(ARTIFACTS_DIR / "scaler_rest.joblib")
+_ARTIFACT_NAMES = ("model_young", "model_rest", "scaler_young", "scaler_rest")
+
+# Which dump of each artifact to load: "joblib" (the default, shipped files) or
+# "pickle" for `<name>.pkl` dumps, choose after timing both on the deployment
+ARTIFACT_FORMAT = os.environ.get("ARTIFACT_FORMAT", "joblib")
+
+logger = logging.getLogger(__name__)
+
+
+# Feature order the models were trained on
+_EXPECTED_COLUMNS = [
+    'age', 'number_of_dependants', 'income_lakhs', 'insurance_plan', 'genetical_risk', 'normalized_risk_score',
+    'gender_Male', 'region_Northwest', 'region_Southeast', 'region_Southwest', 'marital_status_Unmarried',
+    'bmi_category_Obesity', 'bmi_category_Overweight', 'bmi_category_Underweight', 'smoking_status_Occasional',
+    'smoking_status_Regular', 'employment_status_Salaried', 'employment_status_Self-Employed'
+]
+_COL_IDX = {col: idx for idx, col in enumerate(_EXPECTED_COLUMNS)}
+# Column index built once and shared by every DataFrame preprocess_input returns
+_COLUMNS_INDEX = pd.Index(_EXPECTED_COLUMNS)
+
+# Category -> one-hot column index for every categorical input
+_GENDER_IDX = {'Male': _COL_IDX['gender_Male']}
+_REGION_IDX = {
+    'Northwest': _COL_IDX['region_Northwest'],
+    'Southeast': _COL_IDX['region_Southeast'],
+    'Southwest': _COL_IDX['region_Southwest'],
+}
+_MARITAL_IDX = {'Unmarried': _COL_IDX['marital_status_Unmarried']}
+_BMI_IDX = {
+    'Obesity': _COL_IDX['bmi_category_Obesity'],
+    'Overweight': _COL_IDX['bmi_category_Overweight'],
+    'Underweight': _COL_IDX['bmi_category_Underweight'],
+}
+_SMOKING_IDX = {
+    'Occasional': _COL_IDX['smoking_status_Occasional'],
+    'Regular': _COL_IDX['smoking_status_Regular'],
+}
+_EMP_IDX = {
+    'Salaried': _COL_IDX['employment_status_Salaried'],
+    'Self-Employed': _COL_IDX['employment_status_Self-Employed'],
+}
+_INSURANCE_ENCODING = {'Bronze': 1, 'Silver': 2, 'Gold': 3}
+_ONE_HOT_IDX = {
+    'Gender': _GENDER_IDX,
+    'Region': _REGION_IDX,
+    'Marital Status': _MARITAL_IDX,
+    'BMI Category': _BMI_IDX,
+    'Smoking Status': _SMOKING_IDX,
+    'Employment Status': _EMP_IDX,
+}
+
+
+def _cache_resource(func):
+    # Streamlit reruns the script on every interaction, so keep the loaded
+    # artifacts as a per-process singleton instead of reloading them each time
+    if st is not None:
+        return st.cache_resource(func)
+    return functools.lru_cache(maxsize=None)(func)
+
+
+def _cache_data(max_entries, ttl):
+    if st is not None:
+        return st.cache_data(ttl=ttl, max_entries=max_entries)
+    return functools.lru_cache(maxsize=max_entries)
+
+
+def _file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _load_artifact(name):
+    path = ARTIFACTS_DIR / f"{name}.joblib"
+    if ARTIFACT_FORMAT == "pickle":
+        # Small estimators without large numpy arrays can load faster from a
+        # plain pickle. `<name>.pkl.sha256` records the hash of the .joblib
+        # the pickle was made from, so a stale pickle is never served
+        pickle_path = ARTIFACTS_DIR / f"{name}.pkl"
+        hash_path = ARTIFACTS_DIR / f"{name}.pkl.sha256"
+        if not pickle_path.exists() or not hash_path.exists():
+            raise ValueError(
+                f"ARTIFACT_FORMAT=pickle needs {pickle_path.name} and {hash_path.name} in {ARTIFACTS_DIR}"
+            )
+        if hash_path.read_text().strip() != _file_sha256(path):
+            raise ValueError(f"{pickle_path.name} was not made from the current {path.name}, dump it again")
+        logger.info("Loading %s", pickle_path)
+        with open(pickle_path, "rb") as f:
+            return pickle.load(f)
+    if ARTIFACT_FORMAT != "joblib":
+        raise ValueError(f"ARTIFACT_FORMAT must be 'joblib' or 'pickle', got {ARTIFACT_FORMAT!r}")
+
+    logger.info("Loading %s", path)
+    # Memory-map numpy buffers so app processes can share them. This only
+    # matters for estimators holding large arrays, not the shipped ones.
+    # joblib falls back to a normal load for compressed dumps, which are then
+    # decompressed once and kept in the _load_all cache
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            "ignore", message=r'mmap_mode ".*" is not compatible with compressed file', category=UserWarning
+        )
+        return joblib.load(path, mmap_mode="r")
+
+
+def _ensure_scaler_format(scaler_object):
+    # Scaler artifacts are {'scaler': fitted scaler, 'cols_to_scale': [...]},
+    # check the format once at load time rather than on every prediction
+    if not isinstance(scaler_object, dict):
+        raise ValueError(f"Scaler artifact must be a dict, got {type(scaler_object).__name__}")
+    missing = {'scaler', 'cols_to_scale'} - scaler_object.keys()
+    if missing:
+        raise ValueError(f"Scaler artifact is missing keys: {sorted(missing)}")
+    if not scaler_object['cols_to_scale']:
+        raise ValueError("Scaler artifact does not say which columns to scale")
+    return {'scaler': scaler_object['scaler'], 'cols_to_scale': list(scaler_object['cols_to_scale'])}
+
+
+def _affine_params(scaler_object):
+    # Reduce a fitted scaler to `x * mult + add` on our feature positions so a
+    # single row can be scaled without the overhead of scaler.transform
+    scaler = scaler_object['scaler']
+    if hasattr(scaler, 'data_range_'):  # MinMaxScaler
+        if getattr(scaler, 'clip', False):
+            return None
+        mult, add = scaler.scale_, scaler.min_
+    elif hasattr(scaler, 'mean_'):  # StandardScaler
+        mean = scaler.mean_ if scaler.with_mean else 0.0
+        scale = scaler.scale_ if scaler.with_std else 1.0
+        mult = np.ones(scaler.n_features_in_) / scale
+        add = -np.asarray(mean) * mult
+    else:
+        return None
+
+    # 'income_level' is only there because the scaler was fitted with it,
+    # it is not a model feature so its scaled value is never needed
+    cols_to_scale = list(getattr(scaler, 'feature_names_in_', scaler_object['cols_to_scale']))
+    keep = [i for i, col in enumerate(cols_to_scale) if col in _COL_IDX]
+    idxs = np.array([_COL_IDX[cols_to_scale[i]] for i in keep])
+    return idxs, np.asarray(mult, dtype=np.float64)[keep], np.asarray(add, dtype=np.float64)[keep]
+
+
+def _strip_feature_names(model):
+    # The models were fitted on DataFrames, but we feed them rows that are
+    # already in _EXPECTED_COLUMNS order, so drop the stored names to let
+    # them take a bare ndarray without warnings or validation errors
+    if hasattr(model, 'get_booster'):  # XGBoost
+        booster = model.get_booster()
+        feature_names = booster.feature_names
+    else:
+        feature_names = getattr(model, 'feature_names_in_', None)
+    if feature_names is None:
+        return model
+    if list(feature_names) != _EXPECTED_COLUMNS:
+        raise ValueError(f"Model was fitted on unexpected columns: {list(feature_names)}")
+
+    if hasattr(model, 'get_booster'):
+        booster.feature_names = None
+    else:
+        del model.feature_names_in_
+    return model
+
+
+def _make_predictor(model):
+    # Rows reaching the models are already validated, ordered and typed, so
+    # call the fitted internals directly and skip the predict() input checks
+    if hasattr(model, 'get_booster'):  # XGBoost
+        booster = model.get_booster()
+        best_iteration = getattr(model, 'best_iteration', None)
+        iteration_range = (0, best_iteration + 1) if best_iteration is not None else (0, 0)
+
+        def predict_xgb(X):
+            # XGBoost works on float32 internally, so hand it float32 rows up front
+            X = np.ascontiguousarray(X, dtype=np.float32)
+            return booster.inplace_predict(
+                X, iteration_range=iteration_range, missing=model.missing, validate_features=False
+            )
+        return predict_xgb
+
+    if isinstance(model, LinearRegression) and np.ndim(model.coef_) == 1:
+        coef, intercept = np.asarray(model.coef_), model.intercept_
+
+        def predict_linear(X):
+            return X @ coef + intercept
+        return predict_linear
+
+    return model.predict
+
+
+@_cache_resource
+def _load_all():
+    # Load your models and scalers
+    arts = {name: _load_artifact(name) for name in _ARTIFACT_NAMES}
+    arts["scaler_young"] = _ensure_scaler_format(arts["scaler_young"])
+    arts["scaler_rest"] = _ensure_scaler_format(arts["scaler_rest"])
+    _strip_feature_names(arts["model_young"])
+    _strip_feature_names(arts["model_rest"])
+    arts["predict_young"] = _make_predictor(arts["model_young"])
+    arts["predict_rest"] = _make_predictor(arts["model_rest"])
+    arts["scaling_young"] = _affine_params(arts["scaler_young"])
+    arts["scaling_rest"] = _affine_params(arts["scaler_rest"])
+    return arts
+
 
 def calculate_normalized_risk(medical_history):
     risk_scores = {
@@ -34,90 +246,124 @@ def calculate_normalized_risk(medical_history):
 
     return normalized_risk_score
 
-def preprocess_input(input_dict):
-    # Define the expected columns and initialize the DataFrame with zeros
-    expected_columns = [
-        'age', 'number_of_dependants', 'income_lakhs', 'insurance_plan', 'genetical_risk', 'normalized_risk_score',
-        'gender_Male', 'region_Northwest', 'region_Southeast', 'region_Southwest', 'marital_status_Unmarried',
-        'bmi_category_Obesity', 'bmi_category_Overweight', 'bmi_category_Underweight', 'smoking_status_Occasional',
-        'smoking_status_Regular', 'employment_status_Salaried', 'employment_status_Self-Employed'
-    ]
-
-    insurance_plan_encoding = {'Bronze': 1, 'Silver': 2, 'Gold': 3}
-
-    df = pd.DataFrame(0, columns=expected_columns, index=[0])
-    # df.fillna(0, inplace=True)
-
-    # Manually assign values for each categorical input based on input_dict
-    for key, value in input_dict.items():
-        if key == 'Gender' and value == 'Male':
-            df['gender_Male'] = 1
-        elif key == 'Region':
-            if value == 'Northwest':
-                df['region_Northwest'] = 1
-            elif value == 'Southeast':
-                df['region_Southeast'] = 1
-            elif value == 'Southwest':
-                df['region_Southwest'] = 1
-        elif key == 'Marital Status' and value == 'Unmarried':
-            df['marital_status_Unmarried'] = 1
-        elif key == 'BMI Category':
-            if value == 'Obesity':
-                df['bmi_category_Obesity'] = 1
-            elif value == 'Overweight':
-                df['bmi_category_Overweight'] = 1
-            elif value == 'Underweight':
-                df['bmi_category_Underweight'] = 1
-        elif key == 'Smoking Status':
-            if value == 'Occasional':
-                df['smoking_status_Occasional'] = 1
-            elif value == 'Regular':
-                df['smoking_status_Regular'] = 1
-        elif key == 'Employment Status':
-            if value == 'Salaried':
-                df['employment_status_Salaried'] = 1
-            elif value == 'Self-Employed':
-                df['employment_status_Self-Employed'] = 1
-        elif key == 'Insurance Plan':  # Correct key usage with case sensitivity
-            df['insurance_plan'] = insurance_plan_encoding.get(value, 1)
-        elif key == 'Age':  # Correct key usage with case sensitivity
-            df['age'] = value
-        elif key == 'Number of Dependants':  # Correct key usage with case sensitivity
-            df['number_of_dependants'] = value
-        elif key == 'Income in Lakhs':  # Correct key usage with case sensitivity
-            df['income_lakhs'] = value
-        elif key == "Genetical Risk":
-            df['genetical_risk'] = value
+_MEDICAL_HISTORY_OPTIONS = CATEGORICAL_OPTIONS["Medical History"]
+# The options are a closed set, so score them once up front
+_NORMALIZED_RISK_CACHE = {opt: calculate_normalized_risk(opt) for opt in _MEDICAL_HISTORY_OPTIONS}
+
+def _build_row(input_dict):
+    # Fill a plain NumPy row by column position, pandas scalar setters are far slower
+    row = np.zeros(len(_EXPECTED_COLUMNS), dtype=np.float64)
+
+    # Inputs come from the app's fixed widgets, so index them directly.
+    # One-hot encode each categorical input with a single lookup, the
+    # drop-first baseline categories have no column and are left at zero
+    for key, lookup in _ONE_HOT_IDX.items():
+        idx = lookup.get(input_dict[key])
+        if idx is not None:
+            row[idx] = 1
+
+    row[_COL_IDX['insurance_plan']] = _INSURANCE_ENCODING.get(input_dict['Insurance Plan'], 1)
+    row[_COL_IDX['age']] = input_dict['Age']
+    row[_COL_IDX['number_of_dependants']] = input_dict['Number of Dependants']
+    row[_COL_IDX['income_lakhs']] = input_dict['Income in Lakhs']
+    row[_COL_IDX['genetical_risk']] = input_dict['Genetical Risk']
 
     # Assuming the 'normalized_risk_score' needs to be calculated based on the 'age'
-    df['normalized_risk_score'] = calculate_normalized_risk(input_dict['Medical History'])
-    df = handle_scaling(input_dict['Age'], df)
+    medical_history = input_dict['Medical History']
+    normalized_risk_score = _NORMALIZED_RISK_CACHE.get(medical_history)
+    if normalized_risk_score is None:
+        normalized_risk_score = calculate_normalized_risk(medical_history)
+    row[_COL_IDX['normalized_risk_score']] = normalized_risk_score
 
-    return df
+    return handle_scaling(input_dict['Age'], row)
 
-def handle_scaling(age, df):
-    # scale age and income_lakhs column
-    if age <= 25:
-        scaler_object = scaler_young
-    else:
-        scaler_object = scaler_rest
+def preprocess_input(input_dict):
+    # Wrap the fresh row without copying it, each call gets its own array so
+    # concurrent sessions never share the frame's data
+    return pd.DataFrame(_build_row(input_dict).reshape(1, -1), columns=_COLUMNS_INDEX, copy=False)
+
+def _scale_rows(X, scaler_object, params):
+    if params is not None:
+        idxs, mult, add = params
+        X[:, idxs] = X[:, idxs] * mult + add
+        return X
 
+    # Fall back to the scaler itself for scaler types we cannot inline
     cols_to_scale = scaler_object['cols_to_scale']
     scaler = scaler_object['scaler']
 
+    df = pd.DataFrame(X, columns=_EXPECTED_COLUMNS)
     df['income_level'] = None # since scaler object expects income_level supply it. This will have no impact on anything
     df[cols_to_scale] = scaler.transform(df[cols_to_scale])
 
-    df.drop('income_level', axis='columns', inplace=True)
+    return df[_EXPECTED_COLUMNS].to_numpy(dtype=np.float64)
+
+def handle_scaling(age, row):
+    # scale age and income_lakhs column
+    arts = _load_all()
+    if age <= 25:
+        scaler_object, params = arts["scaler_young"], arts["scaling_young"]
+    else:
+        scaler_object, params = arts["scaler_rest"], arts["scaling_rest"]
+
+    return _scale_rows(row.reshape(1, -1), scaler_object, params)[0]
 
-    return df
+def _run_model(young, X):
+    arts = _load_all()
+    if young:
+        return arts["predict_young"](X)
+    return arts["predict_rest"](X)
 
 def predict(input_dict):
-    input_df = preprocess_input(input_dict)
+    row = _build_row(input_dict).reshape(1, -1)
+    prediction = _run_model(input_dict['Age'] <= 25, row)
 
-    if input_dict['Age'] <= 25:
-        prediction = model_young.predict(input_df)
-    else:
-        prediction = model_rest.predict(input_df)
+    return int(prediction[0])
+
+def predict_batch(input_dicts):
+    # Vectorized predict for many inputs at once, e.g. premium vs. age curves
+    df = pd.DataFrame(list(input_dicts))
+    n_rows = len(df)
+    if n_rows == 0:
+        return []
+
+    # Integer-code every categorical input as its one-hot column index.
+    # Baseline categories get a spare scratch column, so all one-hot slots
+    # are written in a single unconditional fancy-index assignment
+    scratch_col = len(_EXPECTED_COLUMNS)
+    codes = np.column_stack([
+        df[key].map(lookup).fillna(scratch_col).to_numpy(dtype=np.intp)
+        for key, lookup in _ONE_HOT_IDX.items()
+    ])
+    X = np.zeros((n_rows, scratch_col + 1), dtype=np.float64)
+    X[np.arange(n_rows)[:, None], codes] = 1
+    X = X[:, :scratch_col]
+
+    X[:, _COL_IDX['insurance_plan']] = df['Insurance Plan'].map(_INSURANCE_ENCODING).fillna(1).to_numpy()
+    X[:, _COL_IDX['age']] = df['Age'].to_numpy()
+    X[:, _COL_IDX['number_of_dependants']] = df['Number of Dependants'].to_numpy()
+    X[:, _COL_IDX['income_lakhs']] = df['Income in Lakhs'].to_numpy()
+    X[:, _COL_IDX['genetical_risk']] = df['Genetical Risk'].to_numpy()
+
+    risk = df['Medical History'].map(_NORMALIZED_RISK_CACHE)
+    unknown = risk.isna()
+    if unknown.any():
+        risk[unknown] = df.loc[unknown, 'Medical History'].map(calculate_normalized_risk)
+    X[:, _COL_IDX['normalized_risk_score']] = risk.to_numpy()
+
+    # Split by cohort, scale each subset once and make one model call per cohort
+    arts = _load_all()
+    young_mask = X[:, _COL_IDX['age']] <= 25
+    out = np.empty(n_rows)
+    for young, mask, suffix in ((True, young_mask, "young"), (False, ~young_mask, "rest")):
+        if not mask.any():
+            continue
+        X_sub = _scale_rows(X[mask], arts[f"scaler_{suffix}"], arts[f"scaling_{suffix}"])
+        out[mask] = _run_model(young, X_sub)
+
+    return [int(p) for p in out]
 
-    return int(prediction[0])
\ No newline at end of file
+@_cache_data(max_entries=1024, ttl=24 * 60 * 60)
+def cached_predict(input_items):
+    # input_items is tuple(sorted(input_dict.items())) so the inputs are hashable
+    return predict(dict(input_items))
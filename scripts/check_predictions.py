@@ -0,0 +1,158 @@
+# Checks the fast prediction path in app/helper.py against the original
+# scaler.transform + model.predict path, using the shipped artifacts.
+#
+# Run from the repository root:
+#     python scripts/check_predictions.py
+import itertools
+import sys
+from pathlib import Path
+
+import joblib
+import pandas as pd
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+sys.path.insert(0, str(APP_DIR))
+
+import helper  # noqa: E402
+from constants import CATEGORICAL_OPTIONS  # noqa: E402
+
+# Two ages on each side of the young/rest split at 25
+AGES = (18, 25, 26, 60)
+INCOMES = (5, 80)
+NUMBER_OF_DEPENDANTS = 2
+GENETICAL_RISK = 3
+
+
+def build_grid():
+    keys = list(CATEGORICAL_OPTIONS)
+    rows = []
+    for age, income in itertools.product(AGES, INCOMES):
+        for values in itertools.product(*(CATEGORICAL_OPTIONS[key] for key in keys)):
+            input_dict = dict(zip(keys, values))
+            input_dict.update({
+                "Age": age,
+                "Number of Dependants": NUMBER_OF_DEPENDANTS,
+                "Income in Lakhs": income,
+                "Genetical Risk": GENETICAL_RISK,
+            })
+            rows.append(input_dict)
+    return rows
+
+
+def baseline_risk(medical_history):
+    # calculate_normalized_risk as originally written
+    risk_scores = {
+        "diabetes": 6,
+        "heart disease": 8,
+        "high blood pressure": 6,
+        "thyroid": 5,
+        "no disease": 0,
+        "none": 0
+    }
+    diseases = medical_history.lower().split(" & ")
+    total_risk_score = sum(risk_scores.get(disease, 0) for disease in diseases)
+    return (total_risk_score - 0) / (14 - 0)
+
+
+def baseline_encode(input_dict):
+    # The original preprocess_input encoding, before scaling
+    insurance_plan_encoding = {'Bronze': 1, 'Silver': 2, 'Gold': 3}
+    row = dict.fromkeys(helper._EXPECTED_COLUMNS, 0)
+    for key, value in input_dict.items():
+        if key == 'Gender' and value == 'Male':
+            row['gender_Male'] = 1
+        elif key == 'Region':
+            if value == 'Northwest':
+                row['region_Northwest'] = 1
+            elif value == 'Southeast':
+                row['region_Southeast'] = 1
+            elif value == 'Southwest':
+                row['region_Southwest'] = 1
+        elif key == 'Marital Status' and value == 'Unmarried':
+            row['marital_status_Unmarried'] = 1
+        elif key == 'BMI Category':
+            if value == 'Obesity':
+                row['bmi_category_Obesity'] = 1
+            elif value == 'Overweight':
+                row['bmi_category_Overweight'] = 1
+            elif value == 'Underweight':
+                row['bmi_category_Underweight'] = 1
+        elif key == 'Smoking Status':
+            if value == 'Occasional':
+                row['smoking_status_Occasional'] = 1
+            elif value == 'Regular':
+                row['smoking_status_Regular'] = 1
+        elif key == 'Employment Status':
+            if value == 'Salaried':
+                row['employment_status_Salaried'] = 1
+            elif value == 'Self-Employed':
+                row['employment_status_Self-Employed'] = 1
+        elif key == 'Insurance Plan':
+            row['insurance_plan'] = insurance_plan_encoding.get(value, 1)
+        elif key == 'Age':
+            row['age'] = value
+        elif key == 'Number of Dependants':
+            row['number_of_dependants'] = value
+        elif key == 'Income in Lakhs':
+            row['income_lakhs'] = value
+        elif key == "Genetical Risk":
+            row['genetical_risk'] = value
+    row['normalized_risk_score'] = baseline_risk(input_dict['Medical History'])
+    return row
+
+
+def baseline_predict(rows):
+    # Load fresh artifacts, _load_all adjusts its cached models in place
+    arts = {
+        name: joblib.load(helper.ARTIFACTS_DIR / f"{name}.joblib")
+        for name in ("model_young", "model_rest", "scaler_young", "scaler_rest")
+    }
+    df = pd.DataFrame([baseline_encode(row) for row in rows], columns=helper._EXPECTED_COLUMNS)
+    young_mask = (df['age'] <= 25).to_numpy()
+
+    out = pd.Series(0, index=df.index, dtype="int64")
+    for mask, suffix in ((young_mask, "young"), (~young_mask, "rest")):
+        scaler_object = arts[f"scaler_{suffix}"]
+        cols_to_scale = scaler_object['cols_to_scale']
+        sub = df[mask].copy()
+        # MinMaxScaler.transform is elementwise, so scaling all rows at once
+        # matches scaling them one by one
+        sub['income_level'] = None
+        sub[cols_to_scale] = scaler_object['scaler'].transform(sub[cols_to_scale])
+        sub = sub.drop('income_level', axis='columns')
+
+        model = arts[f"model_{suffix}"]
+        if suffix == "young":
+            # Row by row, exactly as the app used to call the linear model
+            preds = [int(model.predict(sub.iloc[[i]])[0]) for i in range(len(sub))]
+        else:
+            # Tree predictions do not depend on the other rows in the call
+            preds = [int(p) for p in model.predict(sub)]
+        out[mask] = preds
+    return out.tolist()
+
+
+def report_mismatches(label, rows, expected, actual):
+    bad = [i for i, (e, a) in enumerate(zip(expected, actual)) if e != a]
+    if not bad:
+        print(f"{label}: all {len(rows)} predictions match")
+        return True
+    print(f"{label}: {len(bad)} of {len(rows)} predictions differ, first few:")
+    for i in bad[:10]:
+        print(f"  expected {expected[i]}, got {actual[i]} for {rows[i]}")
+    return False
+
+
+def main():
+    rows = build_grid()
+    expected = baseline_predict(rows)
+    single = [helper.predict(row) for row in rows]
+    batch = helper.predict_batch(rows)
+
+    ok = report_mismatches("predict vs original path", rows, expected, single)
+    ok = report_mismatches("predict_batch vs predict", rows, single, batch) and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())